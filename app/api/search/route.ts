@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { OPENSEARCH_HOST, PRODUCT_INDEX } from '@/lib/config'
+import { PRODUCT_SOURCE_EXCLUDES, toIndexVector } from '@/lib/vectorQuantization'
 import OpenAI from 'openai'
 
 const openai = new OpenAI({
@@ -70,7 +71,7 @@ export async function POST(request: NextRequest) {
           input: filters.query,
         })
         
-        const queryEmbedding = embeddingResponse.data[0].embedding
+        const queryEmbedding = toIndexVector(embeddingResponse.data[0].embedding)
         
         // Use KNN vector search for semantic similarity
         mustClauses.push({
@@ -183,6 +184,7 @@ export async function POST(request: NextRequest) {
       query,
       from,
       size,
+      _source: { excludes: PRODUCT_SOURCE_EXCLUDES },
       sort: [
         { _score: { order: 'desc' } },
         { rating: { order: 'desc', missing: '_last' } },
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { OPENSEARCH_HOST } from '@/lib/config'
+import { SUPPORT_SOURCE_EXCLUDES, toIndexVector } from '@/lib/vectorQuantization'
 import { OpenAI } from 'openai'
 
 const SUPPORT_INDEX = 'lexora_support'
@@ -74,10 +75,11 @@ export async function POST(request: NextRequest) {
     const searchBody: any = {
       size,
       from,
+      _source: { excludes: SUPPORT_SOURCE_EXCLUDES },
       query: {
         knn: {
           vector_field: {
-            vector: queryEmbedding,
+            vector: toIndexVector(queryEmbedding),
             k: size + from // Account for pagination
           }
         }
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { OPENSEARCH_HOST, PRODUCT_INDEX } from '@/lib/config'
+import { toIndexVector } from '@/lib/vectorQuantization'
 
 export async function POST(request: NextRequest) {
   try {
@@ -24,7 +25,7 @@ export async function POST(request: NextRequest) {
         script: {
           source: 'ctx._source.image_embedding_vector = params.embedding',
           params: {
-            embedding: embedding
+            embedding: toIndexVector(embedding)
           }
         },
         query: {
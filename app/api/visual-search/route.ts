@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { OPENSEARCH_HOST, PRODUCT_INDEX } from '@/lib/config'
+import { PRODUCT_SOURCE_EXCLUDES, toIndexVector } from '@/lib/vectorQuantization'
 
 // Helper to store query for debugging
 function storeQueryForViewer(query: any, index: string) {
@@ -138,7 +139,7 @@ export async function POST(request: NextRequest) {
           {
             knn: {
               image_embedding_vector: {
-                vector: embedding,
+                vector: toIndexVector(embedding),
                 k: size,
               },
             },
@@ -175,6 +176,7 @@ export async function POST(request: NextRequest) {
       query,
       from,
       size,
+      _source: { excludes: PRODUCT_SOURCE_EXCLUDES },
       sort: [
         { _score: { order: 'desc' } },
         { rating: { order: 'desc', missing: '_last' } },
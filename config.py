@@ -4,29 +4,78 @@ All environment variables should be accessed through this file
 """
 
 import os
+from dataclasses import dataclass, field
 from typing import Optional
 
-# OpenSearch Configuration
-OPENSEARCH_HOST: str = os.getenv("OPENSEARCH_HOST", "localhost:9200")
-PRODUCT_INDEX: str = os.getenv("PRODUCT_INDEX", "lexora_products")
-DOMAIN_KNOWLEDGE_INDEX: str = os.getenv("DOMAIN_KNOWLEDGE_INDEX", "lexora_internal_doc")
-SUPPORT_KNOWLEDGE_INDEX: str = os.getenv("SUPPORT_KNOWLEDGE_INDEX", "lexora_support")
+# Snapshot the environment once; every setting below is read from this dict
+_ENV = dict(os.environ)
 
-# OpenAI Configuration
-OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
-# Use text-embedding-ada-002 for consistency across all embeddings (products, support, etc.)
-OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "text-embedding-ada-002")
-EMBEDDING_DIMENSION: int = int(os.getenv("EMBEDDING_DIMENSION", "1536"))
+# Repository root, for defaults that must not depend on the working directory
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Unstructured.io Configuration
-UNSTRUCTURED_API_KEY: Optional[str] = os.getenv("UNSTRUCTURED_API_KEY")
 
-# Document Paths
-DOCUMENT_PATH: str = os.getenv("DOCUMENT_PATH", "LEXORA.md")
-SUPPORT_DOCUMENT_PATH: str = os.getenv("SUPPORT_DOCUMENT_PATH", "LEXORA_SUPPORT_KNOWLEDGE_BASE.md")
+@dataclass(frozen=True)
+class Config:
+    """Immutable view of all settings, read once from the environment at import."""
 
-# Ingestion Settings
-MIN_CHUNK_LENGTH: int = int(os.getenv("MIN_CHUNK_LENGTH", "100"))
+    # OpenSearch Configuration
+    OPENSEARCH_HOST: str = _ENV.get("OPENSEARCH_HOST", "localhost:9200")
+    PRODUCT_INDEX: str = _ENV.get("PRODUCT_INDEX", "lexora_products")
+    DOMAIN_KNOWLEDGE_INDEX: str = _ENV.get("DOMAIN_KNOWLEDGE_INDEX", "lexora_internal_doc")
+    SUPPORT_KNOWLEDGE_INDEX: str = _ENV.get("SUPPORT_KNOWLEDGE_INDEX", "lexora_support")
+
+    # OpenAI Configuration
+    OPENAI_API_KEY: Optional[str] = field(default=_ENV.get("OPENAI_API_KEY"), repr=False)
+    # Use text-embedding-ada-002 for consistency across all embeddings (products, support, etc.)
+    OPENAI_MODEL: str = _ENV.get("OPENAI_MODEL", "text-embedding-ada-002")
+    EMBEDDING_DIMENSION: int = int(_ENV.get("EMBEDDING_DIMENSION", "1536"))
+
+    # Vector Storage
+    # "byte" stores knn_vector fields as int8 (4x smaller HNSW graphs), "float" keeps float32
+    VECTOR_DATA_TYPE: str = _ENV.get("VECTOR_DATA_TYPE", "byte")
+    # Default HNSW candidate list size at query time (dynamic index setting, no rebuild needed)
+    KNN_EF_SEARCH: int = int(_ENV.get("KNN_EF_SEARCH", "64"))
+
+    # Index Storage
+    PRODUCT_SHARDS: int = int(_ENV.get("PRODUCT_SHARDS", "2"))
+    SUPPORT_SHARDS: int = int(_ENV.get("SUPPORT_SHARDS", "1"))
+    # Stored-fields codec; "best_compression" works on every OpenSearch version,
+    # "zstd"/"zstd_no_dict" need OpenSearch 2.10+
+    INDEX_CODEC: str = _ENV.get("INDEX_CODEC", "best_compression")
+
+    # Unstructured.io Configuration
+    UNSTRUCTURED_API_KEY: Optional[str] = field(default=_ENV.get("UNSTRUCTURED_API_KEY"), repr=False)
+
+    # Document Paths
+    DOCUMENT_PATH: str = _ENV.get("DOCUMENT_PATH", "LEXORA.md")
+    SUPPORT_DOCUMENT_PATH: str = _ENV.get("SUPPORT_DOCUMENT_PATH", "LEXORA_SUPPORT_KNOWLEDGE_BASE.md")
+
+    # Ingestion Settings
+    MIN_CHUNK_LENGTH: int = int(_ENV.get("MIN_CHUNK_LENGTH", "100"))
+    # SQLite file caching embeddings by hash of (model, text) across ingest runs
+    EMBEDDING_CACHE_PATH: str = _ENV.get("EMBEDDING_CACHE_PATH", os.path.join(_REPO_DIR, ".embed_cache.sqlite"))
+
+
+config = Config()
+
+# Module-level aliases for existing `from config import X` imports
+OPENSEARCH_HOST: str = config.OPENSEARCH_HOST
+PRODUCT_INDEX: str = config.PRODUCT_INDEX
+DOMAIN_KNOWLEDGE_INDEX: str = config.DOMAIN_KNOWLEDGE_INDEX
+SUPPORT_KNOWLEDGE_INDEX: str = config.SUPPORT_KNOWLEDGE_INDEX
+OPENAI_API_KEY: Optional[str] = config.OPENAI_API_KEY
+OPENAI_MODEL: str = config.OPENAI_MODEL
+EMBEDDING_DIMENSION: int = config.EMBEDDING_DIMENSION
+VECTOR_DATA_TYPE: str = config.VECTOR_DATA_TYPE
+KNN_EF_SEARCH: int = config.KNN_EF_SEARCH
+PRODUCT_SHARDS: int = config.PRODUCT_SHARDS
+SUPPORT_SHARDS: int = config.SUPPORT_SHARDS
+INDEX_CODEC: str = config.INDEX_CODEC
+UNSTRUCTURED_API_KEY: Optional[str] = config.UNSTRUCTURED_API_KEY
+DOCUMENT_PATH: str = config.DOCUMENT_PATH
+SUPPORT_DOCUMENT_PATH: str = config.SUPPORT_DOCUMENT_PATH
+MIN_CHUNK_LENGTH: int = config.MIN_CHUNK_LENGTH
+EMBEDDING_CACHE_PATH: str = config.EMBEDDING_CACHE_PATH
 
 # Validation
 if not OPENAI_API_KEY:
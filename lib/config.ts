@@ -15,6 +15,10 @@ export const OPENAI_API_KEY = process.env.OPENAI_API_KEY
 export const OPENAI_MODEL = process.env.OPENAI_MODEL || 'text-embedding-ada-002'
 export const EMBEDDING_DIMENSION = parseInt(process.env.EMBEDDING_DIMENSION || '1536', 10)
 
+// Vector Storage
+// "byte" stores knn_vector fields as int8 (4x smaller HNSW graphs), "float" keeps float32
+export const VECTOR_DATA_TYPE = process.env.VECTOR_DATA_TYPE || 'byte'
+
 // Unstructured.io Configuration
 export const UNSTRUCTURED_API_KEY = process.env.UNSTRUCTURED_API_KEY
 
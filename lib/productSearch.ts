@@ -1,4 +1,5 @@
 import { OPENSEARCH_HOST, PRODUCT_INDEX } from '@/lib/config'
+import { PRODUCT_SOURCE_EXCLUDES, toIndexVector } from '@/lib/vectorQuantization'
 import OpenAI from 'openai'
 
 const openai = new OpenAI({
@@ -145,7 +146,7 @@ export async function performProductSearch(
           input: embeddingQuery,
         })
         
-        const queryEmbedding = embeddingResponse.data[0].embedding
+        const queryEmbedding = toIndexVector(embeddingResponse.data[0].embedding)
         
         // Use KNN vector search for semantic similarity (ranking within allowed categories)
         mustClauses.push({
@@ -286,6 +287,7 @@ export async function performProductSearch(
       query,
       from,
       size,
+      _source: { excludes: PRODUCT_SOURCE_EXCLUDES },
       sort: [
         { _score: { order: 'desc' } },
         { rating: { order: 'desc', missing: '_last' } },
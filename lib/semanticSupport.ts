@@ -5,6 +5,7 @@
 
 import { OpenAI } from 'openai'
 import { OPENSEARCH_HOST } from './config'
+import { SUPPORT_SOURCE_EXCLUDES, toIndexVector } from './vectorQuantization'
 
 const SUPPORT_INDEX = 'lexora_support'
 const OPENAI_MODEL = 'text-embedding-ada-002' // Match ingestion script
@@ -69,10 +70,11 @@ async function searchSupportChunks(query: string, size: number = 5): Promise<{ c
   // Simple top-level k-NN query for support documents (text embeddings only)
   const searchBody: any = {
     size,
+    _source: { excludes: SUPPORT_SOURCE_EXCLUDES },
     query: {
       knn: {
         vector_field: {
-          vector: queryEmbedding,
+          vector: toIndexVector(queryEmbedding),
           k: size
         }
       }
@@ -0,0 +1,31 @@
+import { VECTOR_DATA_TYPE } from '@/lib/config'
+
+/**
+ * Vector fields to leave out of search responses via _source.excludes
+ * Vectors are never rendered, so returning them only inflates the payload
+ */
+export const PRODUCT_SOURCE_EXCLUDES = ['text_embedding_vector', 'image_embedding_vector']
+export const SUPPORT_SOURCE_EXCLUDES = ['vector_field', 'text_embedding_vector']
+
+/**
+ * Convert an embedding into the representation stored in knn_vector fields
+ * With VECTOR_DATA_TYPE=byte the vector is scaled so its largest component maps
+ * to 127 and rounded to int8 (cosine similarity ignores the per-vector scale)
+ * Mirrors to_index_vector in vector_utils.py
+ */
+export function toIndexVector(vector: number[]): number[] {
+  if (VECTOR_DATA_TYPE !== 'byte') {
+    return vector
+  }
+
+  let maxAbs = 0
+  for (const value of vector) {
+    maxAbs = Math.max(maxAbs, Math.abs(value))
+  }
+  if (maxAbs === 0) {
+    return vector.map(() => 0)
+  }
+
+  const scale = 127 / maxAbs
+  return vector.map(value => Math.max(-128, Math.min(127, Math.round(value * scale))))
+}
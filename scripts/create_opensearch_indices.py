@@ -3,25 +3,54 @@
 Create all OpenSearch indices for LEXORA based on data models.
 
 Usage:
-    python scripts/create_opensearch_indices.py
+    python scripts/create_opensearch_indices.py [--wait-for-green]
 """
 
+import argparse
+import asyncio
 import os
 import sys
-import json
-import requests
+import httpx
 
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import OPENSEARCH_HOST
+from config import (
+    OPENSEARCH_HOST,
+    VECTOR_DATA_TYPE,
+    KNN_EF_SEARCH,
+    PRODUCT_SHARDS,
+    SUPPORT_SHARDS,
+    INDEX_CODEC
+)
 
-def create_index(index_name: str, mapping: dict, opensearch_host: str) -> bool:
+# Long descriptive fields are only matched term-by-term (ranking comes from the
+# embeddings and title boosts), so they skip positions, term frequencies and norms.
+# This is the index layout of match_only_text, which needs OpenSearch 2.12+ (the
+# bundled image is 2.11). Trade-off: ~30-50% smaller inverted index and faster
+# ingest, but BM25 ignores term frequency/field length on these fields and
+# phrase/proximity queries against them are rejected.
+MATCH_ONLY_TEXT = {"type": "text", "index_options": "docs", "norms": False}
+
+# brand/category are filtered as keywords; the .text subfield only serves the
+# fallback multi_match in the search routes, so it skips positions and norms.
+KEYWORD_TEXT_SUBFIELD = {"type": "text", "index_options": "freqs", "norms": False}
+
+# HNSW graph parameters per vector type. ada-002 text embeddings are well
+# separated, so a smaller graph reaches the same recall; MobileNet image features
+# are denser and benefit from more links. Recall is tuned at query time instead
+# of by over-building ef_construction: through the knn query's k on the Lucene
+# engine, or the dynamic index.knn.algo_param.ef_search (KNN_EF_SEARCH) on
+# nmslib/faiss, which can be changed via _settings without a rebuild.
+TEXT_HNSW_PARAMETERS = {"ef_construction": 100, "m": 16}
+IMAGE_HNSW_PARAMETERS = {"ef_construction": 200, "m": 32}
+
+async def create_index(client: httpx.AsyncClient, index_name: str, mapping: dict, opensearch_host: str) -> bool:
     """Create an OpenSearch index with the given mapping."""
     url = f"{opensearch_host}/{index_name}"
     
     # Delete existing index if it exists
     try:
-        response = requests.delete(url)
+        response = await client.delete(url)
         if response.status_code == 200:
             print(f"  Deleted existing index: {index_name}")
     except:
@@ -29,7 +58,7 @@ def create_index(index_name: str, mapping: dict, opensearch_host: str) -> bool:
     
     # Create new index
     try:
-        response = requests.put(url, json=mapping, headers={'Content-Type': 'application/json'})
+        response = await client.put(url, json=mapping)
         if response.status_code == 200:
             print(f"  ✓ Created index: {index_name}")
             return True
@@ -40,7 +69,39 @@ def create_index(index_name: str, mapping: dict, opensearch_host: str) -> bool:
         print(f"  ✗ Error creating {index_name}: {e}")
         return False
 
+
+async def create_indices(indices: list, opensearch_host: str, wait_for_health: bool) -> bool:
+    """Create all indices concurrently, optionally waiting once for cluster health at the end."""
+    async with httpx.AsyncClient(timeout=60) as client:
+        results = await asyncio.gather(
+            *[create_index(client, name, mapping, opensearch_host) for name, mapping in indices]
+        )
+
+        if wait_for_health:
+            print("\nWaiting for cluster health (yellow or better)...")
+            try:
+                response = await client.get(
+                    f"{opensearch_host}/_cluster/health",
+                    params={"wait_for_status": "yellow", "timeout": "30s"},
+                    timeout=40
+                )
+                health = response.json()
+                print(f"  Cluster status: {health.get('status')} (timed out: {health.get('timed_out')})")
+            except Exception as e:
+                print(f"  ✗ Error checking cluster health: {e}")
+
+    return all(results)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Create all OpenSearch indices for LEXORA")
+    parser.add_argument(
+        "--wait-for-green",
+        action="store_true",
+        help="after creating the indices, wait up to 30s for the cluster to reach at least yellow health"
+    )
+    args = parser.parse_args()
+
     print("Creating OpenSearch indices")
     print("=" * 50)
     
@@ -49,16 +110,18 @@ def main():
         opensearch_url = f"http://{OPENSEARCH_HOST}"
     else:
         opensearch_url = OPENSEARCH_HOST
+
+    indices = []
     
     # 1. Product Index
-    print("\n1. Creating product index (lexora_products)...")
     product_mapping = {
         "settings": {
             "index": {
                 "knn": True,
-                "knn.algo_param.ef_search": 100,
-                "number_of_shards": 1,
-                "number_of_replicas": 0
+                "knn.algo_param.ef_search": KNN_EF_SEARCH,
+                "number_of_shards": PRODUCT_SHARDS,
+                "number_of_replicas": 0,
+                "codec": INDEX_CODEC
             },
             "analysis": {
                 "analyzer": {
@@ -77,15 +140,15 @@ def main():
                     "type": "text",
                     "fields": {"keyword": {"type": "keyword"}}
                 },
-                "description": {"type": "text"},
+                "description": MATCH_ONLY_TEXT,
                 "price": {"type": "float"},
                 "brand": {
                     "type": "keyword",
-                    "fields": {"text": {"type": "text"}}
+                    "fields": {"text": KEYWORD_TEXT_SUBFIELD}
                 },
                 "category": {
                     "type": "keyword",
-                    "fields": {"text": {"type": "text"}}
+                    "fields": {"text": KEYWORD_TEXT_SUBFIELD}
                 },
                 "SKU": {"type": "keyword"},
                 "availability_status": {"type": "keyword"},
@@ -103,21 +166,25 @@ def main():
                 "text_embedding_vector": {
                     "type": "knn_vector",
                     "dimension": 1536,
+                    "data_type": VECTOR_DATA_TYPE,
+                    "doc_values": False,
                     "method": {
                         "name": "hnsw",
                         "space_type": "cosinesimil",
                         "engine": "lucene",
-                        "parameters": {"ef_construction": 128, "m": 24}
+                        "parameters": TEXT_HNSW_PARAMETERS
                     }
                 },
                 "image_embedding_vector": {
                     "type": "knn_vector",
                     "dimension": 1280,
+                    "data_type": VECTOR_DATA_TYPE,
+                    "doc_values": False,
                     "method": {
                         "name": "hnsw",
                         "space_type": "cosinesimil",
                         "engine": "lucene",
-                        "parameters": {"ef_construction": 128, "m": 24}
+                        "parameters": IMAGE_HNSW_PARAMETERS
                     }
                 },
                 "popularity_score": {"type": "float"},
@@ -130,17 +197,17 @@ def main():
             }
         }
     }
-    create_index("lexora_products", product_mapping, opensearch_url)
+    indices.append(("lexora_products", product_mapping))
     
     # 2. Support Document Index
-    print("\n2. Creating support document index (lexora_support)...")
     support_mapping = {
         "settings": {
             "index": {
                 "knn": True,
-                "knn.algo_param.ef_search": 100,
-                "number_of_shards": 1,
-                "number_of_replicas": 0
+                "knn.algo_param.ef_search": KNN_EF_SEARCH,
+                "number_of_shards": SUPPORT_SHARDS,
+                "number_of_replicas": 0,
+                "codec": INDEX_CODEC
             }
         },
         "mappings": {
@@ -150,36 +217,41 @@ def main():
                     "type": "text",
                     "fields": {"keyword": {"type": "keyword"}}
                 },
-                "content": {"type": "text"},
-                "text": {"type": "text"},
-                "page_content": {"type": "text"},
+                "content": MATCH_ONLY_TEXT,
+                # Chunk text is stored once; these names resolve to it at query time
+                "text": {"type": "alias", "path": "content"},
+                "page_content": {"type": "alias", "path": "content"},
                 "doc_type": {"type": "keyword"},
                 "category": {"type": "keyword"},
                 "chunk_id": {"type": "keyword"},
                 "parent_doc_id": {"type": "keyword"},
-                "chunk_text": {"type": "text"},
+                "chunk_text": MATCH_ONLY_TEXT,
                 "chunk_index": {"type": "integer"},
                 "metadata": {"type": "object", "enabled": True},
                 "keywords": {"type": "keyword"},
-                "keywords_text": {"type": "text"},
+                "keywords_text": MATCH_ONLY_TEXT,
                 "vector_field": {
                     "type": "knn_vector",
                     "dimension": 1536,
+                    "data_type": VECTOR_DATA_TYPE,
+                    "doc_values": False,
                     "method": {
                         "name": "hnsw",
                         "space_type": "cosinesimil",
                         "engine": "lucene",
-                        "parameters": {"ef_construction": 128, "m": 24}
+                        "parameters": TEXT_HNSW_PARAMETERS
                     }
                 },
                 "text_embedding_vector": {
                     "type": "knn_vector",
                     "dimension": 1536,
+                    "data_type": VECTOR_DATA_TYPE,
+                    "doc_values": False,
                     "method": {
                         "name": "hnsw",
                         "space_type": "cosinesimil",
                         "engine": "lucene",
-                        "parameters": {"ef_construction": 128, "m": 24}
+                        "parameters": TEXT_HNSW_PARAMETERS
                     }
                 },
                 "relevance_score": {"type": "float"},
@@ -189,22 +261,19 @@ def main():
             }
         }
     }
-    create_index("lexora_support", support_mapping, opensearch_url)
+    indices.append(("lexora_support", support_mapping))
     
     # 3. User Authentication Index
-    print("\n3. Creating user authentication index (lexora_users_auth)...")
     auth_mapping = {
         "settings": {
             "number_of_shards": 1,
-            "number_of_replicas": 0
+            "number_of_replicas": 0,
+            "codec": INDEX_CODEC
         },
         "mappings": {
             "properties": {
                 "user_id": {"type": "keyword"},
-                "email": {
-                    "type": "keyword",
-                    "fields": {"text": {"type": "text"}}
-                },
+                "email": {"type": "keyword"},
                 "username": {"type": "keyword"},
                 "password_hash": {"type": "keyword"},
                 "auth_provider": {"type": "keyword"},
@@ -215,18 +284,18 @@ def main():
                 "session_token": {"type": "keyword"},
                 "expires_at": {"type": "date"},
                 "ip_address": {"type": "ip"},
-                "user_agent": {"type": "text"}
+                "user_agent": MATCH_ONLY_TEXT
             }
         }
     }
-    create_index("lexora_users_auth", auth_mapping, opensearch_url)
+    indices.append(("lexora_users_auth", auth_mapping))
     
     # 4. User Profile Index
-    print("\n4. Creating user profile index (lexora_users_profile)...")
     profile_mapping = {
         "settings": {
             "number_of_shards": 1,
-            "number_of_replicas": 0
+            "number_of_replicas": 0,
+            "codec": INDEX_CODEC
         },
         "mappings": {
             "properties": {
@@ -300,14 +369,14 @@ def main():
             }
         }
     }
-    create_index("lexora_users_profile", profile_mapping, opensearch_url)
+    indices.append(("lexora_users_profile", profile_mapping))
     
     # 5. Collaborative Signals Index
-    print("\n5. Creating collaborative signals index (lexora_collaborative_signals)...")
     collaborative_mapping = {
         "settings": {
             "number_of_shards": 1,
-            "number_of_replicas": 0
+            "number_of_replicas": 0,
+            "codec": INDEX_CODEC
         },
         "mappings": {
             "properties": {
@@ -370,8 +439,14 @@ def main():
             }
         }
     }
-    create_index("lexora_collaborative_signals", collaborative_mapping, opensearch_url)
+    indices.append(("lexora_collaborative_signals", collaborative_mapping))
     
+    print(f"\nCreating {len(indices)} indices...")
+    if not asyncio.run(create_indices(indices, opensearch_url, args.wait_for_green)):
+        print("\n" + "=" * 50)
+        print("Some indices failed to create, see errors above")
+        sys.exit(1)
+
     print("\n" + "=" * 50)
     print("All indices created successfully!")
     print("\nCreated indices:")
@@ -184,10 +184,12 @@ curl -X PUT "$OPENSEARCH_HOST/lexora_support" -H 'Content-Type: application/json
         "type": "text"
       },
       "text": {
-        "type": "text"
+        "type": "alias",
+        "path": "content"
       },
       "page_content": {
-        "type": "text"
+        "type": "alias",
+        "path": "content"
       },
       "doc_type": {
         "type": "keyword"
@@ -13,88 +13,196 @@ This script:
 5. Optionally generates OpenAI text embeddings (1536‑dim) if OPENAI_API_KEY is set
 6. Indexes all products into OpenSearch (preserves existing products)
 
+Products that already have an image embedding in the index are skipped, so
+re-runs only embed new or previously failed products.
+
 Usage:
-    python scripts/ingest_additional_products.py
+    python scripts/ingest_additional_products.py [--force]
 """
 
+import argparse
+import asyncio
 import os
+import shutil
 import sys
-import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterator, List, Dict, Any, Optional
 
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import OPENSEARCH_HOST, PRODUCT_INDEX, OPENAI_API_KEY
+from vector_utils import to_index_vector
 
 try:
     from opensearchpy import OpenSearch, helpers
     import tensorflow as tf
     import tensorflow_hub as hub
-    import numpy as np
-    from PIL import Image
-    import requests
-    from io import BytesIO
+    import aiohttp
+    from openai import OpenAI, RateLimitError
+    from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+    import ijson
+    import orjson
 except ImportError as e:
     print(f"Error: Missing required package. Please install:")
-    print("pip install opensearch-py tensorflow tensorflow-hub pillow requests openai")
+    print("pip install opensearch-py tensorflow tensorflow-hub aiohttp openai tenacity ijson orjson")
     sys.exit(1)
 
 # Load MobileNet model
+# The hub module is frozen into a local SavedModel on first run; later runs load it directly
 print("Loading MobileNet model...")
 model_url = "https://tfhub.dev/google/imagenet/mobilenet_v2_100_224/feature_vector/5"
-model = hub.KerasLayer(model_url, input_shape=(224, 224, 3))
+MOBILENET_SAVED_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mobilenet_v2_sm")
+if not os.path.isdir(MOBILENET_SAVED_MODEL_DIR):
+    print(f"  Freezing {model_url} into {MOBILENET_SAVED_MODEL_DIR}...")
+    # Saved without Keras (hub.KerasLayer is not a Keras 3 layer), into a temp dir that is
+    # moved into place only once complete, so an interrupted save is never loaded later
+    staging_dir = tempfile.mkdtemp(prefix="mobilenet_v2_sm.", dir=os.path.dirname(MOBILENET_SAVED_MODEL_DIR))
+    try:
+        tf.saved_model.save(hub.load(model_url), staging_dir)
+        os.replace(staging_dir, MOBILENET_SAVED_MODEL_DIR)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+model = tf.saved_model.load(MOBILENET_SAVED_MODEL_DIR)
 print("✓ MobileNet model loaded successfully")
 
+# Images are downloaded concurrently and embedded IMAGE_BATCH_SIZE at a time
+IMAGE_BATCH_SIZE = 64
+IMAGE_FETCH_CONCURRENCY = 64
+
 
-def load_and_preprocess_image(image_url):
-    """Load image from URL and preprocess for MobileNet."""
+@tf.function(jit_compile=True, input_signature=[tf.TensorSpec((None, 224, 224, 3), tf.float16)])
+def embed_images(batch):
+    """Run MobileNet on a (B, 224, 224, 3) float16 batch as a single XLA-compiled graph."""
+    # Batches travel through the input pipeline as float16 (half the buffer size);
+    # the upcast fuses into the first convolution and the weights stay float32
+    return tf.cast(model(tf.cast(batch, tf.float32), training=False), tf.float32)
+
+
+async def _fetch_image_bytes(session, image_url):
+    """Download raw image bytes from URL."""
     try:
-        response = requests.get(image_url, timeout=10)
-        response.raise_for_status()
-        img = Image.open(BytesIO(response.content))
-        img = img.convert('RGB')
-        img = img.resize((224, 224))
-        img_array = np.array(img) / 255.0
-        img_array = np.expand_dims(img_array, axis=0)
-        return img_array
+        async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            return await response.read()
     except Exception as e:
         print(f"  ✗ Error loading image {image_url}: {e}")
         return None
 
 
-def generate_image_embedding(image_url):
-    """Generate MobileNet embedding for an image."""
-    img_array = load_and_preprocess_image(image_url)
-    if img_array is None:
-        return None
-    
+async def _fetch_images(session, image_urls):
+    """Download all image URLs concurrently; the connector limit caps in-flight requests."""
+    return await asyncio.gather(*(_fetch_image_bytes(session, url) for url in image_urls))
+
+
+async def _open_image_session():
+    """Create the pooled image download session (must run inside the event loop)."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=IMAGE_FETCH_CONCURRENCY, ttl_dns_cache=300)
+    )
+
+
+@contextmanager
+def image_fetcher():
+    """
+    Yield a function that downloads a list of image URLs concurrently.
+
+    One aiohttp session (and its keep-alive connection pool) is shared for the
+    whole run; each call drives its downloads to completion on a private event loop.
+    """
+    loop = asyncio.new_event_loop()
+    session = loop.run_until_complete(_open_image_session())
     try:
-        embedding = model(img_array)
-        embedding_list = embedding.numpy().flatten().tolist()
-        return embedding_list
-    except Exception as e:
-        print(f"  ✗ Error generating embedding: {e}")
-        return None
+        yield lambda image_urls: loop.run_until_complete(_fetch_images(session, image_urls))
+    finally:
+        loop.run_until_complete(session.close())
+        loop.close()
 
 
-def generate_text_embedding(text):
-    """Generate OpenAI text embedding."""
-    if not OPENAI_API_KEY:
-        print("  ⚠ Warning: OPENAI_API_KEY not set, skipping text embeddings")
-        return None
-    
+def decode_and_preprocess_image(image_bytes):
+    """Decode and resize image bytes in-graph into a (224, 224, 3) float16 tensor for MobileNet."""
+    img = tf.io.decode_image(image_bytes, channels=3, expand_animations=False)
+    img = tf.image.resize(img, (224, 224))
+    return tf.cast(img * (1 / 255), tf.float16)
+
+
+def generate_image_embeddings(image_urls, fetch_images):
+    """
+    Generate MobileNet embeddings for a batch of image URLs.
+
+    Downloads run concurrently through fetch_images; decoding and resizing run in a
+    tf.data pipeline that feeds the model one batch at a time. Returns one
+    embedding (or None on failure) per URL, in order.
+    """
+    embeddings = [None] * len(image_urls)
+    fetched = [
+        (i, image_bytes)
+        for i, image_bytes in enumerate(fetch_images(image_urls))
+        if image_bytes is not None
+    ]
+    if not fetched:
+        return embeddings
+
+    indices, image_bytes = zip(*fetched)
+    dataset = (
+        tf.data.Dataset.from_tensor_slices((list(indices), list(image_bytes)))
+        .map(lambda i, b: (i, decode_and_preprocess_image(b)), num_parallel_calls=tf.data.AUTOTUNE)
+        .ignore_errors()  # drop images that fail to decode; their embedding stays None
+        .batch(IMAGE_BATCH_SIZE)
+        .prefetch(2)
+    )
+
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=text
-        )
-        return response.data[0].embedding
+        for batch_indices, batch in dataset:
+            vectors = embed_images(batch).numpy()
+            for i, vector in zip(batch_indices.numpy(), vectors):
+                embeddings[i] = vector.tolist()
     except Exception as e:
-        print(f"  ✗ Error generating text embedding: {e}")
-        return None
+        print(f"  ✗ Error generating embeddings: {e}")
+
+    return embeddings
+
+
+# One OpenAI client for the whole run; texts are embedded in batches per API call.
+# The SDK's own retries are disabled so the tenacity policy below is the only one.
+_openai_client = OpenAI(api_key=OPENAI_API_KEY, max_retries=0) if OPENAI_API_KEY else None
+TEXT_EMBEDDING_BATCH_SIZE = 256
+
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    wait=wait_exponential(multiplier=1, max=30),
+    stop=stop_after_attempt(6),
+    reraise=True
+)
+def _embed_texts(texts):
+    """Embed a list of texts in a single API call, backing off on 429s."""
+    response = _openai_client.embeddings.create(
+        model="text-embedding-ada-002",
+        input=texts
+    )
+    return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+
+def generate_text_embeddings_batch(texts, chunk=TEXT_EMBEDDING_BATCH_SIZE):
+    """Generate OpenAI text embeddings. Returns one embedding (or None on failure) per text."""
+    if _openai_client is None:
+        print("  ⚠ Warning: OPENAI_API_KEY not set, skipping text embeddings")
+        return [None] * len(texts)
+
+    embeddings = []
+    for start in range(0, len(texts), chunk):
+        batch = texts[start:start + chunk]
+        try:
+            embeddings.extend(_embed_texts(batch))
+            print(f"  ✓ Text embeddings generated for {start + len(batch)}/{len(texts)} products")
+        except Exception as e:
+            print(f"  ✗ Error generating text embeddings for products {start + 1}-{start + len(batch)}: {e}")
+            embeddings.extend([None] * len(batch))
+    return embeddings
 
 
 def connect_opensearch():
@@ -106,9 +214,14 @@ def connect_opensearch():
         else:
             opensearch_url = OPENSEARCH_HOST
         
+        # Pool sized for the parallel bulk threads so each gets its own keep-alive connection
         client = OpenSearch(
             hosts=[opensearch_url],
             http_compress=True,
+            pool_maxsize=32,
+            timeout=60,
+            retry_on_timeout=True,
+            max_retries=3,
             use_ssl=False,
             verify_certs=False,
             ssl_assert_hostname=False,
@@ -120,20 +233,21 @@ def connect_opensearch():
         sys.exit(1)
 
 
-def _load_json_if_exists(filename: str) -> List[Dict[str, Any]]:
-    """Load products from JSON file if it exists, otherwise return empty list."""
+def _iter_products(filename: str) -> Iterator[Dict[str, Any]]:
+    """Stream products one at a time from a JSON array file, if it exists."""
     filepath = os.path.join(os.path.dirname(__file__), filename)
     if not os.path.exists(filepath):
         print(f"  ⚠ {filename} not found, skipping")
-        return []
+        return
+    count = 0
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        print(f"✓ Loaded {len(data)} products from {filename}")
-        return data
+        with open(filepath, "rb") as f:
+            for product in ijson.items(f, "item", use_float=True):
+                count += 1
+                yield product
+        print(f"✓ Loaded {count} products from {filename}")
     except Exception as e:
         print(f"  ✗ Error loading {filename}: {e}")
-        return []
 
 
 def _normalize_product(p: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -197,13 +311,12 @@ def _normalize_product(p: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
 def load_and_merge_products() -> List[Dict[str, Any]]:
     """Load, normalize, and merge products from all JSON sources."""
-    print("\nLoading products from JSON files...")
-    raw_products: List[Dict[str, Any]] = []
-    raw_products += _load_json_if_exists("additional_products.json")
-    raw_products += _load_json_if_exists("sample_products.json")
-    raw_products += _load_json_if_exists("premium_products.json")
-
-    print(f"\nNormalizing {len(raw_products)} raw products...")
+    print("\nLoading and normalizing products from JSON files...")
+    raw_products = chain(
+        _iter_products("additional_products.json"),
+        _iter_products("sample_products.json"),
+        _iter_products("premium_products.json"),
+    )
     normalized: List[Dict[str, Any]] = []
     seen_ids = set()
 
@@ -211,7 +324,7 @@ def load_and_merge_products() -> List[Dict[str, Any]]:
         norm = _normalize_product(p)
         if not norm:
             continue
-        pid = norm["id"]
+        pid = sys.intern(norm["id"])
         if pid in seen_ids:
             print(f"  ⚠ Skipping duplicate id {pid}")
             continue
@@ -221,8 +334,8 @@ def load_and_merge_products() -> List[Dict[str, Any]]:
     # Write merged JSON for inspection/debugging
     merged_path = os.path.join(os.path.dirname(__file__), "products_merged.json")
     try:
-        with open(merged_path, "w") as f:
-            json.dump(normalized, f, indent=2)
+        with open(merged_path, "wb") as f:
+            f.write(orjson.dumps(normalized, option=orjson.OPT_INDENT_2))
         print(f"\n✓ Wrote merged products file with {len(normalized)} items to {merged_path}")
     except Exception as e:
         print(f"  ⚠ Failed to write products_merged.json: {e}")
@@ -230,72 +343,161 @@ def load_and_merge_products() -> List[Dict[str, Any]]:
     return normalized
 
 
-def ingest_products(client, products):
-    """Ingest products into OpenSearch."""
+def _text_for_embedding(product):
+    """Build the text embedded for a product."""
+    # Use semantic_description if available (from premium products), otherwise use regular description
+    semantic_desc = product.get('semantic_description', '')
+    return f"{product['name']} {product['description']} {semantic_desc} {product['category']} {product.get('brand', '')}"
+
+
+def _product_actions(products, text_embeddings, fetch_images, now_iso):
+    """Yield bulk index actions as each image embedding batch completes."""
+    for start in range(0, len(products), IMAGE_BATCH_SIZE):
+        batch = products[start:start + IMAGE_BATCH_SIZE]
+        print(f"\nGenerating MobileNet image embeddings for products "
+              f"{start + 1}-{start + len(batch)}/{len(products)}...")
+        image_embeddings = generate_image_embeddings(
+            [product['image_url'] for product in batch], fetch_images
+        )
+
+        for idx, (product, image_embedding) in enumerate(zip(batch, image_embeddings), start + 1):
+            print(f"\n[{idx}/{len(products)}] {product['name']}")
+            print(f"  Product ID: {product['id']}")
+            print(f"  Image URL: {product['image_url'][:70]}...")
+
+            if image_embedding:
+                print(f"  ✓ MobileNet embedding generated (dimension: {len(image_embedding)})")
+            else:
+                print("  ✗ Failed to generate image embedding")
+
+            text_embedding = text_embeddings.get(product['id'])
+
+            if text_embedding:
+                print(f"  ✓ Text embedding generated (dimension: {len(text_embedding)})")
+            else:
+                print("  ⚠ Skipping text embedding")
+
+            # Prepare document
+            doc = {
+                **product,
+                'created_at': now_iso,
+                'updated_at': now_iso
+            }
+
+            if image_embedding:
+                doc['image_embedding_vector'] = to_index_vector(image_embedding)
+
+            if text_embedding:
+                doc['text_embedding_vector'] = to_index_vector(text_embedding)
+
+            yield {
+                "_index": PRODUCT_INDEX,
+                "_id": product['id'],
+                "_source": doc
+            }
+
+
+def _already_ingested_ids(client, products) -> set:
+    """Return ids of products already indexed with an image embedding."""
+    try:
+        resp = client.mget(
+            index=PRODUCT_INDEX,
+            body={"ids": [p["id"] for p in products]},
+            _source=["image_embedding_vector"]
+        )
+    except Exception as e:
+        print(f"  ⚠ Could not check existing products, ingesting all: {e}")
+        return set()
+    return {
+        doc["_id"]
+        for doc in resp["docs"]
+        if doc.get("found") and doc["_source"].get("image_embedding_vector")
+    }
+
+
+def _set_refresh_interval(client, value):
+    """Set the product index refresh_interval; None restores the cluster default (1s)."""
+    try:
+        client.indices.put_settings(
+            index=PRODUCT_INDEX,
+            body={"index": {"refresh_interval": value}}
+        )
+    except Exception as e:
+        print(f"  ⚠ Could not set refresh_interval to {value}: {e}")
+
+
+def ingest_products(client, products, force=False):
+    """Ingest products into OpenSearch, skipping already-embedded ones unless force is set."""
     print("\n" + "="*60)
     print("INGESTING ADDITIONAL PRODUCTS (NO DELETION)")
     print("="*60)
     
     success_count = 0
     failed_count = 0
-    
-    for idx, product in enumerate(products, 1):
-        print(f"\n[{idx}/{len(products)}] {product['name']}")
-        print(f"  Product ID: {product['id']}")
-        
-        # Generate image embedding
-        print("  Generating MobileNet image embedding...")
-        print(f"  Image URL: {product['image_url'][:70]}...")
-        image_embedding = generate_image_embedding(product['image_url'])
-        
-        if image_embedding:
-            print(f"  ✓ MobileNet embedding generated (dimension: {len(image_embedding)})")
-        else:
-            print("  ✗ Failed to generate image embedding")
-        
-        # Generate text embedding
-        print("  Generating OpenAI text embedding...")
-        # Use semantic_description if available (from premium products), otherwise use regular description
-        semantic_desc = product.get('semantic_description', '')
-        text_for_embedding = f"{product['name']} {product['description']} {semantic_desc} {product['category']} {product.get('brand', '')}"
-        text_embedding = generate_text_embedding(text_for_embedding)
-        
-        if text_embedding:
-            print(f"  ✓ Text embedding generated (dimension: {len(text_embedding)})")
-        else:
-            print("  ⚠ Skipping text embedding")
-        
-        # Prepare document
-        doc = {
-            **product,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
-        
-        if image_embedding:
-            doc['image_embedding_vector'] = image_embedding
-        
-        if text_embedding:
-            doc['text_embedding_vector'] = text_embedding
-        
-        # Index document
-        try:
-            client.index(
-                index=PRODUCT_INDEX,
-                id=product['id'],
-                body=doc,
-                refresh=True
-            )
-            print("  ✓ Successfully indexed in OpenSearch")
-            success_count += 1
-        except Exception as e:
-            print(f"  ✗ Error indexing product: {e}")
-            failed_count += 1
-    
+    skipped_count = 0
+
+    if not force and products:
+        already = _already_ingested_ids(client, products)
+        if already:
+            products = [p for p in products if p["id"] not in already]
+            skipped_count = len(already)
+            print(f"\n✓ Skipping {skipped_count} products already in the index (use --force to re-ingest)")
+
+    if not products:
+        print("\n✓ Nothing new to ingest")
+        return
+
+    print("\nGenerating OpenAI text embeddings...")
+    text_embeddings = dict(zip(
+        (product['id'] for product in products),
+        generate_text_embeddings_batch([_text_for_embedding(product) for product in products])
+    ))
+
+    # One timestamp for the whole run instead of two datetime calls per document
+    now_iso = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    # Stream documents to OpenSearch in bulk chunks instead of one request
+    # (and one refresh) per product, with several bulk requests in flight.
+    # Periodic refreshes are paused for the bulk load and restored afterwards.
+    _set_refresh_interval(client, "-1")
+    try:
+        with image_fetcher() as fetch_images:
+            for ok, item in helpers.parallel_bulk(
+                client,
+                _product_actions(products, text_embeddings, fetch_images, now_iso),
+                thread_count=8,
+                chunk_size=100,
+                queue_size=8,
+                request_timeout=120,
+                raise_on_error=False
+            ):
+                if ok:
+                    success_count += 1
+                else:
+                    failed_count += 1
+                    error_info = item.get('index', {})
+                    print(f"  ✗ Error indexing product {error_info.get('_id', 'unknown')}: {error_info.get('error')}")
+
+        print(f"\n✓ Bulk indexed {success_count} products in OpenSearch")
+    except Exception as e:
+        print(f"  ✗ Error during bulk indexing: {e}")
+        failed_count = len(products) - success_count
+    finally:
+        _set_refresh_interval(client, None)
+
+    # Make the new documents searchable and merge the HNSW segments for faster search
+    try:
+        client.indices.refresh(index=PRODUCT_INDEX)
+        client.indices.forcemerge(index=PRODUCT_INDEX, max_num_segments=1, request_timeout=600)
+        print("✓ Refreshed and force-merged index")
+    except Exception as e:
+        print(f"  ⚠ Error refreshing/merging index: {e}")
+
     print("\n" + "="*60)
     print("INGESTION SUMMARY")
     print("="*60)
     print(f"  Total products processed: {len(products)}")
+    print(f"  Skipped (already ingested): {skipped_count}")
     print(f"  Successfully ingested: {success_count}")
     print(f"  Failed: {failed_count}")
     print("="*60)
@@ -328,6 +530,14 @@ def verify_index(client):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest products with MobileNet and OpenAI embeddings")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-embed and re-index products that are already in the index"
+    )
+    args = parser.parse_args()
+
     print("\n" + "="*60)
     print("ADDITIONAL PRODUCTS INGESTION WITH MOBILENET EMBEDDINGS")
     print("="*60)
@@ -347,7 +557,7 @@ def main():
     products = load_and_merge_products()
     
     # Ingest products (without deletion)
-    ingest_products(client, products)
+    ingest_products(client, products, force=args.force)
     
     # Verify
     verify_index(client)
@@ -5,20 +5,39 @@ Ingest LEXORA support knowledge base document into OpenSearch using Unstructured
 Usage:
     export UNSTRUCTURED_API_KEY="your-api-key"
     export OPENAI_API_KEY="your-openai-key"
-    python ingest_support_knowledge.py
+    python ingest_support_knowledge.py [document.md | "docs/**/*.md" ...]
+
+With no arguments, SUPPORT_DOCUMENT_PATH is ingested.
 """
 
 import os
 import sys
-import json
-import requests
-from typing import List, Dict, Any
-import time
+import argparse
+import glob
+import asyncio
+import random
+import base64
+import hashlib
+import sqlite3
 import re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional
 from collections import Counter
-from openai import OpenAI
-from opensearchpy import OpenSearch
+from concurrent.futures import ThreadPoolExecutor
+from openai import AsyncOpenAI, BadRequestError, RateLimitError
+from opensearchpy import JSONSerializer, OpenSearch
+from opensearchpy.exceptions import SerializationError
+from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 import numpy as np
+import orjson
+
+# tiktoken gives exact token counts for batch packing; without it fall back to ~4 chars/token
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -30,15 +49,65 @@ from config import (
     SUPPORT_DOCUMENT_PATH,
     OPENAI_MODEL,
     EMBEDDING_DIMENSION,
+    EMBEDDING_CACHE_PATH,
     MIN_CHUNK_LENGTH
 )
+from vector_utils import to_index_array
 
 # Configuration (using centralized config)
 OPENSEARCH_INDEX = SUPPORT_KNOWLEDGE_INDEX
 DOCUMENT_PATH = SUPPORT_DOCUMENT_PATH
 
+# Embedding requests are packed up to a token budget (the API allows 300k tokens
+# and 2048 inputs per request), with a bounded number of requests in flight
+EMBEDDING_TOKEN_BUDGET = 200_000
+EMBEDDING_MAX_ITEMS = 2048
+MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+
+# Documents per bulk request when indexing chunks
+BULK_CHUNK_SIZE = 500
+
+# Source documents are parsed concurrently; the work is waiting on Unstructured.io
+MAX_FILE_WORKERS = 8
+
 # Initialize clients
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+# The SDK's own retries are disabled so _wait_for_rate_limit is the only retry policy
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+
+# Pooled session for Unstructured.io, shared by the file workers (one connection each);
+# retries rate limits and transient server errors
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=MAX_FILE_WORKERS,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"})
+    )
+))
+
+
+class OrjsonSerializer(JSONSerializer):
+    """JSONSerializer backed by orjson, which also encodes numpy arrays natively."""
+
+    def loads(self, s: Any) -> Any:
+        try:
+            return orjson.loads(s)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(s, e)
+
+    def dumps(self, data: Any) -> Any:
+        # don't serialize strings
+        if isinstance(data, str):
+            return data
+
+        try:
+            return orjson.dumps(data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        except (ValueError, TypeError) as e:
+            raise SerializationError(data, e)
+
 
 # Parse OPENSEARCH_HOST properly (handle both "localhost:9200" and "http://localhost:9200")
 opensearch_host = OPENSEARCH_HOST.replace("http://", "").replace("https://", "")
@@ -46,11 +115,34 @@ host_parts = opensearch_host.split(":")
 opensearch_client = OpenSearch(
     hosts=[{"host": host_parts[0], "port": int(host_parts[1]) if len(host_parts) > 1 else 9200}],
     http_compress=True,
+    serializer=OrjsonSerializer(),
     use_ssl=False,
     verify_certs=False
 )
 
 
+# Common stop words filtered out of extracted keywords
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been', 'be', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must',
+    'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+    'what', 'which', 'who', 'when', 'where', 'why', 'how', 'if', 'then', 'than',
+    'my', 'your', 'his', 'her', 'its', 'our', 'their', 'me', 'him', 'us', 'them'
+})
+_STOP_WORD_BYTES = frozenset(word.encode("ascii") for word in _STOP_WORDS)
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+# Byte translation table for tokenizing ASCII text: lowercases letters, marks digits and
+# "_" with "0" (so "abc123" is not a keyword), and turns everything else into spaces
+_WORD_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else
+    c if 97 <= c <= 122 else
+    48 if 48 <= c <= 57 or c == 95 else
+    32
+    for c in range(256)
+)
+
+
 def process_with_unstructured(file_path: str) -> List[Dict[str, Any]]:
     """Process document using Unstructured.io API with by_title chunking."""
     print(f"Processing {file_path} with Unstructured.io API...")
@@ -69,40 +161,37 @@ def process_with_unstructured(file_path: str) -> List[Dict[str, Any]]:
             "overlap": 200
         }
         
-        response = requests.post(url, headers=headers, files=files, data=data)
+        response = _SESSION.post(url, headers=headers, files=files, data=data)
         response.raise_for_status()
         
-        elements = response.json()
+        elements = orjson.loads(response.content)
         print(f"Received {len(elements)} elements from Unstructured.io")
         return elements
 
 
 def extract_keywords(text: str) -> List[str]:
     """Extract important keywords from text for BM25 search."""
-    # Common stop words to filter out
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-        'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been', 'be', 'have', 'has', 'had',
-        'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must',
-        'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
-        'what', 'which', 'who', 'when', 'where', 'why', 'how', 'if', 'then', 'than',
-        'my', 'your', 'his', 'her', 'its', 'our', 'their', 'me', 'him', 'us', 'them'
-    }
-    
-    # Convert to lowercase and split into words
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    
-    # Filter out stop words and get unique keywords
-    keywords = [word for word in words if word not in stop_words]
-    
-    # Count frequency and get top keywords (limit to 20 most common)
-    keyword_counts = Counter(keywords)
-    top_keywords = [word for word, count in keyword_counts.most_common(20)]
+    if text.isascii():
+        # Tokenize in C: translate/split yields lowercase word runs
+        keyword_counts = Counter(text.encode("ascii").translate(_WORD_TABLE).split())
+        
+        # Keep only all-letter words of 3+ characters that aren't stop words, checking each
+        # distinct word once rather than every token
+        for word in [word for word in keyword_counts
+                     if len(word) < 3 or b"0" in word or word in _STOP_WORD_BYTES]:
+            del keyword_counts[word]
+        
+        # Top keywords (limit to 20 most common)
+        return [word.decode("ascii") for word, count in keyword_counts.most_common(20)]
     
-    return top_keywords
+    # Non-ASCII letters are word characters to \b, so only the regex splits such text correctly
+    keyword_counts = Counter(_WORD_RE.findall(text.lower()))
+    for word in [word for word in keyword_counts if word in _STOP_WORDS]:
+        del keyword_counts[word]
+    return [word for word, count in keyword_counts.most_common(20)]
 
 
-def filter_chunks(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def filter_chunks(elements: List[Dict[str, Any]], source_path: str = DOCUMENT_PATH) -> List[Dict[str, Any]]:
     """Filter out chunks that are too short or empty."""
     filtered = []
     
@@ -121,15 +210,17 @@ def filter_chunks(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             # Extract keywords for BM25 search
             keywords = extract_keywords(text)
             
+            metadata = element.get("metadata") or {}
+            if not isinstance(metadata, dict):
+                metadata = {}
+            
             # Extract title if available (from metadata or first line)
-            title = ""
-            metadata = element.get("metadata", {})
-            if isinstance(metadata, dict):
-                title = metadata.get("title", "") or metadata.get("filename", "")
+            title = metadata.get("title") or metadata.get("filename") or ""
             
             # If no title in metadata, try to extract from first line
             if not title:
-                first_line = text.split('\n')[0].strip()
+                newline = text.find('\n')
+                first_line = (text[:newline] if newline != -1 else text).strip()
                 if len(first_line) < 100:  # Reasonable title length
                     title = first_line
             
@@ -140,7 +231,7 @@ def filter_chunks(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                 "title": title,  # Add title for better matching
                 "type": element.get("type", "unknown"),
                 "metadata": {
-                    "source": metadata.get("filename", DOCUMENT_PATH) if isinstance(metadata, dict) else DOCUMENT_PATH,
+                    "source": metadata.get("filename", source_path),
                     "element_id": element.get("element_id", ""),
                     "category": element.get("category", ""),
                 }
@@ -153,103 +244,268 @@ def filter_chunks(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return filtered
 
 
-def generate_embeddings(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Generate embeddings for chunks using OpenAI."""
+def _expand_paths(patterns: List[str]) -> List[str]:
+    """Expand glob patterns (including **) into file paths, keeping order and dropping duplicates."""
+    paths: List[str] = []
+    for pattern in patterns:
+        # Unmatched patterns are kept as-is so they are reported as missing
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])
+    return list(dict.fromkeys(paths))
+
+
+def _process_file(file_path: str) -> List[Dict[str, Any]]:
+    """Parse one document with Unstructured.io and return its filtered chunks."""
+    return filter_chunks(process_with_unstructured(file_path), file_path)
+
+
+_rate_limit_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_for_rate_limit(retry_state: RetryCallState) -> float:
+    """Wait as long as the 429's Retry-After header asks, else back off exponentially with jitter."""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), 30.0)
+    except (TypeError, ValueError):
+        return _rate_limit_backoff(retry_state)
+
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    wait=_wait_for_rate_limit,
+    stop=stop_after_attempt(6),
+    reraise=True
+)
+async def _embed_texts(texts: List[str]) -> List[np.ndarray]:
+    """Embed a list of texts in a single API call, backing off on rate limits."""
+    # Small jitter so concurrent requests don't hit the rate limiter in lockstep
+    await asyncio.sleep(random.uniform(0, 0.05))
+    # base64 responses decode straight into float32 buffers, never building lists of Python floats
+    response = await openai_client.embeddings.create(
+        model=OPENAI_MODEL,
+        input=texts,
+        encoding_format="base64"
+    )
+    return [
+        np.frombuffer(base64.b64decode(d.embedding), dtype=np.float32)
+        for d in sorted(response.data, key=lambda d: d.index)
+    ]
+
+
+async def _embed_batch(
+    chunks: List[Dict[str, Any]], batch_indices: List[int], semaphore: asyncio.Semaphore
+) -> List[Optional[np.ndarray]]:
+    """Embed the chunks at batch_indices, retrying item-by-item if the batch is rejected as invalid."""
+    async with semaphore:
+        try:
+            embeddings = await _embed_texts([chunks[i]["text"] for i in batch_indices])
+            print(f"Embedded batch of {len(batch_indices)} chunks")
+            return embeddings
+        except BadRequestError as e:
+            print(f"Batch of {len(batch_indices)} chunks rejected ({e}), retrying chunks individually")
+        except Exception as e:
+            print(f"Error generating embeddings for a batch of {len(batch_indices)} chunks: {e}")
+            return [None] * len(batch_indices)
+
+        embeddings: List[Optional[np.ndarray]] = []
+        for i in batch_indices:
+            try:
+                embeddings.extend(await _embed_texts([chunks[i]["text"]]))
+            except Exception as e:
+                print(f"Error generating embedding for chunk {i}: {e}")
+                print(f"Chunk text preview: {chunks[i]['text'][:100]}...")
+                embeddings.append(None)
+        return embeddings
+
+
+def _open_embedding_cache() -> sqlite3.Connection:
+    """Open (creating if needed) the on-disk cache of previously computed embeddings."""
+    conn = sqlite3.connect(EMBEDDING_CACHE_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+    return conn
+
+
+def _cache_key(text: str) -> str:
+    """Cache key for a text; includes the model so switching models never reuses stale vectors."""
+    return hashlib.sha256((OPENAI_MODEL + "\x00" + text).encode("utf-8")).hexdigest()
+
+
+def _cached_embeddings(conn: sqlite3.Connection, keys: List[str]) -> Dict[str, np.ndarray]:
+    """Look up embeddings for keys, returning only the ones present in the cache."""
+    found: Dict[str, np.ndarray] = {}
+    unique_keys = list(dict.fromkeys(keys))
+    # Stay under SQLite's bound-parameter limit
+    for start in range(0, len(unique_keys), 500):
+        batch = unique_keys[start:start + 500]
+        rows = conn.execute(
+            f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+        )
+        for key, vector in rows:
+            found[key] = np.frombuffer(vector, dtype=np.float32)
+    return found
+
+
+def _store_embeddings(conn: sqlite3.Connection, items: List[tuple]) -> None:
+    """Persist (key, embedding) pairs to the cache."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+        [(key, embedding.tobytes()) for key, embedding in items]
+    )
+    conn.commit()
+
+
+def _token_counter():
+    """Return a function counting tokens the way OPENAI_MODEL does (approximate without tiktoken)."""
+    def approximate(text: str) -> int:
+        return len(text) // 4 + 1
+
+    if tiktoken is None:
+        return approximate
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(OPENAI_MODEL)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The BPE file is downloaded on first use; packing still works with the estimate
+        print(f"Warning: tiktoken encoding unavailable ({e}), estimating token counts")
+        return approximate
+    # encode_ordinary treats special-token strings like "<|endoftext|>" as plain text
+    return lambda text: len(encoding.encode_ordinary(text))
+
+
+def _pack_batches(token_counts: List[int]) -> List[List[int]]:
+    """
+    Greedily pack chunk indices, shortest first, into batches that stay within
+    EMBEDDING_TOKEN_BUDGET tokens and EMBEDDING_MAX_ITEMS inputs.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i in sorted(range(len(token_counts)), key=token_counts.__getitem__):
+        if current and (current_tokens + token_counts[i] > EMBEDDING_TOKEN_BUDGET
+                        or len(current) == EMBEDDING_MAX_ITEMS):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += token_counts[i]
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def generate_embeddings(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Generate embeddings for chunks using OpenAI.
+
+    Embeddings already in the EMBEDDING_CACHE_PATH cache are reused, so
+    re-ingesting unchanged text costs nothing. The remaining chunks are sorted
+    by token count and packed into requests up to EMBEDDING_TOKEN_BUDGET tokens,
+    with up to MAX_CONCURRENT_EMBEDDING_REQUESTS requests in flight at once.
+    """
     print(f"Generating embeddings for {len(chunks)} chunks...")
     
     enriched_chunks = []
     
-    for i, chunk in enumerate(chunks):
-        try:
-            text = chunk["text"]
-            
-            # Generate embedding
-            response = openai_client.embeddings.create(
-                model=OPENAI_MODEL,
-                input=text
-            )
-            
-            embedding = response.data[0].embedding
-            
-            # Validate embedding
-            if len(embedding) != EMBEDDING_DIMENSION:
-                print(f"Warning: Chunk {i} has wrong embedding dimension: {len(embedding)}")
-                continue
-            
-            # Check for NaN values
-            if any(np.isnan(val) or np.isinf(val) for val in embedding):
-                print(f"Warning: Chunk {i} contains NaN or Inf values, skipping")
-                continue
-            
-            # Add embedding to chunk
-            chunk["vector_field"] = embedding
-            enriched_chunks.append(chunk)
-            
-            # Progress indicator
-            if (i + 1) % 10 == 0:
-                print(f"Processed {i + 1}/{len(chunks)} chunks...")
-            
-            # Rate limiting - small delay to avoid hitting API limits
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"Error generating embedding for chunk {i}: {e}")
-            print(f"Chunk text preview: {chunk['text'][:100]}...")
+    cache = _open_embedding_cache()
+    keys = [_cache_key(chunk["text"]) for chunk in chunks]
+    cached = _cached_embeddings(cache, keys)
+    embeddings: List[Optional[np.ndarray]] = [cached.get(key) for key in keys]
+    misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    print(f"Embedding cache: {len(chunks) - len(misses)} hits, {len(misses)} misses")
+    
+    count_tokens = _token_counter()
+    batches = [
+        [misses[j] for j in batch]
+        for batch in _pack_batches([count_tokens(chunks[i]["text"]) for i in misses])
+    ]
+    print(f"Packed {len(misses)} chunks into {len(batches)} embedding requests")
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDING_REQUESTS)
+    batch_embeddings = await asyncio.gather(*[
+        _embed_batch(chunks, batch_indices, semaphore) for batch_indices in batches
+    ])
+    
+    # Scatter results back to each chunk's original position
+    for batch_indices, batch_result in zip(batches, batch_embeddings):
+        for i, embedding in zip(batch_indices, batch_result):
+            embeddings[i] = embedding
+    
+    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+        if embedding is None:
+            continue
+        
+        # Validate embedding
+        if len(embedding) != EMBEDDING_DIMENSION:
+            print(f"Warning: Chunk {i} has wrong embedding dimension: {len(embedding)}")
             continue
+        
+        # Check for NaN/Inf values in one vectorized pass
+        if not np.isfinite(embedding).all():
+            print(f"Warning: Chunk {i} contains NaN or Inf values, skipping")
+            continue
+        
+        # Add embedding to chunk
+        chunk["vector_field"] = embedding
+        enriched_chunks.append(chunk)
+    
+    # Only cache vectors that came back from the API and passed validation
+    fresh = set(misses)
+    _store_embeddings(cache, [(keys[i], chunk["vector_field"]) for i, chunk in enumerate(chunks)
+                              if i in fresh and "vector_field" in chunk])
+    cache.close()
     
     print(f"Successfully generated embeddings for {len(enriched_chunks)} chunks")
     return enriched_chunks
 
 
+def _index_actions(chunks: List[Dict[str, Any]]):
+    """Yield one bulk index action per chunk, so only the action being sent is held in memory."""
+    index = OPENSEARCH_INDEX
+    for i, chunk in enumerate(chunks):
+        keywords = chunk.get("keywords", ())
+        metadata = chunk.get("metadata", {})
+        yield {
+            "_index": index,
+            "_id": metadata.get("element_id", f"support_chunk_{i}"),
+            "_source": {
+                # Text field for BM25 keyword search; "text" and "page_content" are
+                # mapping aliases of it for Langflow and other retrieval components
+                "content": chunk["text"],
+                # Keywords for BM25 boosting, also space-separated for full-text matching
+                "keywords": keywords,
+                "keywords_text": " ".join(keywords),
+                "title": chunk.get("title", ""),
+                # Vector field for semantic search (int8 when VECTOR_DATA_TYPE is "byte")
+                "vector_field": to_index_array(chunk["vector_field"]),
+                "metadata": metadata,
+                "type": chunk.get("type", "unknown"),
+            }
+        }
+
+
 def index_to_opensearch(chunks: List[Dict[str, Any]]) -> None:
     """Index chunks into OpenSearch with hybrid search support."""
     print(f"Indexing {len(chunks)} chunks into OpenSearch...")
     
-    # Prepare documents for bulk indexing
-    actions = []
-    for i, chunk in enumerate(chunks):
-        # Prepare document with fields for both BM25 and vector search
-        doc = {
-            # Text fields for BM25 keyword search (with analyzers)
-            "content": chunk["text"],
-            "text": chunk["text"],  # Also include 'text' field for Langflow retrieval
-            "page_content": chunk["text"],  # Some components use page_content
-            
-            # Keywords field for BM25 boosting
-            "keywords": chunk.get("keywords", []),
-            "keywords_text": " ".join(chunk.get("keywords", [])),  # Space-separated for BM25
-            
-            # Title field for better matching
-            "title": chunk.get("title", ""),
-            
-            # Vector field for semantic search
-            "vector_field": chunk["vector_field"],
-            
-            # Metadata
-            "metadata": chunk.get("metadata", {})
-        }
-        
-        # Add any additional fields
-        if "type" in chunk:
-            doc["type"] = chunk["type"]
-        
-        action = {
-            "_index": OPENSEARCH_INDEX,
-            "_id": chunk["metadata"].get("element_id", f"support_chunk_{i}"),
-            "_source": doc
-        }
-        actions.append(action)
-    
-    # Bulk index
-    from opensearchpy.helpers import bulk
+    from opensearchpy.helpers import streaming_bulk
     
     success_count = 0
-    failed_count = 0
+    failed = []
     
     try:
-        # bulk() returns (success_count, failed_items_list)
-        success_count, failed = bulk(opensearch_client, actions, raise_on_error=False)
-        failed_count = len(failed) if failed else 0
+        # streaming_bulk() yields (ok, item) per action; the client gzips each request
+        for ok, item in streaming_bulk(
+            opensearch_client,
+            _index_actions(chunks),
+            chunk_size=BULK_CHUNK_SIZE,
+            raise_on_error=False
+        ):
+            if ok:
+                success_count += 1
+            else:
+                failed.append(item)
+        failed_count = len(failed)
         
         if failed:
             print(f"\nFailed to index {failed_count} documents:")
@@ -288,6 +544,16 @@ def verify_index() -> bool:
 
 def main():
     """Main ingestion pipeline."""
+    parser = argparse.ArgumentParser(description="Ingest support documents into OpenSearch")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[DOCUMENT_PATH],
+        help="documents or glob patterns to ingest (default: SUPPORT_DOCUMENT_PATH)"
+    )
+    args = parser.parse_args()
+    paths = _expand_paths(args.paths)
+    
     print("=" * 60)
     print("LEXORA Support Knowledge Base Ingestion Script")
     print("=" * 60)
@@ -305,30 +571,31 @@ def main():
     if not verify_index():
         return
     
-    # Check if document exists
-    if not os.path.exists(DOCUMENT_PATH):
-        print(f"Error: Document '{DOCUMENT_PATH}' not found")
+    # Check if documents exist
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        for path in missing:
+            print(f"Error: Document '{path}' not found")
         return
     
     try:
-        # Step 1: Process with Unstructured.io
-        elements = process_with_unstructured(DOCUMENT_PATH)
-        
-        # Step 2: Filter chunks
-        chunks = filter_chunks(elements)
+        # Steps 1-2: Process each document with Unstructured.io and filter its chunks
+        print(f"Processing {len(paths)} document(s)...")
+        with ThreadPoolExecutor(max_workers=min(MAX_FILE_WORKERS, len(paths))) as executor:
+            chunks = [chunk for file_chunks in executor.map(_process_file, paths) for chunk in file_chunks]
         
         if not chunks:
             print("Error: No valid chunks after filtering!")
             return
         
         # Step 3: Generate embeddings
-        enriched_chunks = generate_embeddings(chunks)
+        enriched_chunks = asyncio.run(generate_embeddings(chunks))
         
         if not enriched_chunks:
             print("Error: No chunks with valid embeddings!")
             return
         
-        # Step 4: Index to OpenSearch
+        # Step 4: Index all documents' chunks to OpenSearch in one bulk stream
         index_to_opensearch(enriched_chunks)
         
         print("\n" + "=" * 60)
@@ -0,0 +1,44 @@
+"""
+Shared helpers for preparing embedding vectors for OpenSearch knn_vector fields
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from config import VECTOR_DATA_TYPE
+
+
+def _quantize(arr: np.ndarray) -> np.ndarray:
+    """Scale a float32 vector so its largest component maps to 127 and round it to int8."""
+    max_abs = float(np.abs(arr).max()) if arr.size else 0.0
+    if max_abs == 0.0:
+        return np.zeros(arr.shape, dtype=np.int8)
+    return np.clip(np.round(arr * (127.0 / max_abs)), -128, 127).astype(np.int8)
+
+
+def to_index_vector(vector: Sequence[float]) -> Sequence[float]:
+    """
+    Convert an embedding into the representation stored in knn_vector fields.
+
+    With VECTOR_DATA_TYPE="byte" the vector is scaled so its largest component
+    maps to 127 and rounded to int8. The indices use cosine similarity, which
+    ignores per-vector scale, so this keeps as much precision as 8 bits allow.
+    Otherwise the vector is returned unchanged.
+    Mirrors toIndexVector in lib/vectorQuantization.ts.
+    """
+    if VECTOR_DATA_TYPE != "byte":
+        return vector
+    return _quantize(np.asarray(vector, dtype=np.float32)).tolist()
+
+
+def to_index_array(vector: np.ndarray) -> np.ndarray:
+    """
+    Like to_index_vector, but keeps the result as a numpy array (float32, or
+    int8 with VECTOR_DATA_TYPE="byte") for clients whose serializer encodes
+    ndarrays directly.
+    """
+    arr = np.asarray(vector, dtype=np.float32)
+    if VECTOR_DATA_TYPE != "byte":
+        return arr
+    return _quantize(arr)